@@ -32,7 +32,7 @@ CREATE TABLE IF NOT EXISTS weather_snapshots (
     wind_deg INTEGER,
     clouds INTEGER NOT NULL,
     visibility INTEGER,
-    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    timestamp INTEGER DEFAULT (strftime('%s', 'now')),  -- Unix epoch seconds (UTC)
     api_timestamp INTEGER NOT NULL,
     FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE CASCADE
 );
@@ -72,18 +72,24 @@ CREATE TABLE IF NOT EXISTS sync_history (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     location_id INTEGER NOT NULL,
     sync_type VARCHAR(20) NOT NULL,  -- 'current' or 'forecast'
-    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    synced_at INTEGER DEFAULT (strftime('%s', 'now')),  -- Unix epoch seconds (UTC)
     status VARCHAR(20) NOT NULL,  -- 'success' or 'failed'
     error_message TEXT,
     FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE CASCADE
 );
 
 -- Indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_weather_snapshots_location_id ON weather_snapshots(location_id);
+-- Composite (location_id, time) indexes serve the per-location "latest"/ordered reads
+-- without a sort; they supersede the old single-column location_id indexes.
+DROP INDEX IF EXISTS idx_weather_snapshots_location_id;
+DROP INDEX IF EXISTS idx_forecasts_location_id;
+DROP INDEX IF EXISTS idx_sync_history_location_id;
+CREATE INDEX IF NOT EXISTS idx_weather_snapshots_location_timestamp ON weather_snapshots(location_id, timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_weather_snapshots_timestamp ON weather_snapshots(timestamp);
-CREATE INDEX IF NOT EXISTS idx_forecasts_location_id ON forecasts(location_id);
+CREATE INDEX IF NOT EXISTS idx_forecasts_location_timestamp ON forecasts(location_id, forecast_timestamp);
 CREATE INDEX IF NOT EXISTS idx_forecasts_timestamp ON forecasts(forecast_timestamp);
-CREATE INDEX IF NOT EXISTS idx_sync_history_location_id ON sync_history(location_id);
+CREATE INDEX IF NOT EXISTS idx_sync_history_location_status_synced ON sync_history(location_id, status, synced_at DESC);
+CREATE INDEX IF NOT EXISTS idx_locations_name_country ON locations(lower(name), country);
 
 -- Insert default user preferences
 INSERT OR IGNORE INTO user_preferences (key, value) VALUES ('units', 'metric');
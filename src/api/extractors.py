@@ -0,0 +1,69 @@
+"""Runtime-generated accessors for flattening decoded API payloads."""
+from typing import Any, Callable, Dict, Tuple
+
+
+def _access_expr(path: str) -> str:
+    """Translate a dotted path such as ``weather.0.main`` into ``o.weather[0].main``."""
+    expr = "o"
+    for part in path.split("."):
+        if part.isdigit():
+            expr += f"[{part}]"
+        elif part.isidentifier():
+            expr += f".{part}"
+        else:
+            raise ValueError(f"Invalid path segment {part!r} in {path!r}")
+    return expr
+
+
+def build_extractor(field_map: Dict[str, str], name: str = "extract") -> Callable[[Any], Tuple]:
+    """Compile a function returning the mapped values of an object as a tuple.
+    
+    The function is generated once as straight-line code, e.g.
+    ``def extract(o): return (o.main.temp, o.weather[0].main, ...)``,
+    so flattening a payload costs no loops, dict lookups or getattr calls.
+    
+    Args:
+        field_map: Output field name -> dotted source path, in output order
+        name: Name of the generated function
+        
+    Returns:
+        Function mapping a decoded payload to a tuple of values
+    """
+    if not name.isidentifier():
+        raise ValueError(f"Invalid function name: {name!r}")
+    exprs = ", ".join(_access_expr(path) for path in field_map.values())
+    source = f"def {name}(o):\n    return ({exprs},)\n"
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<extractor {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def build_struct_extractor(struct_type: type, paths: Dict[str, str], name: str = "extract") -> Callable[[Any], Tuple]:
+    """Build an extractor whose tuples can be passed positionally to a msgspec Struct.
+    
+    Values are emitted in the struct's field order. Fields without a path
+    must form a trailing run of fields that have defaults, otherwise the
+    positional values would shift onto the wrong fields.
+    
+    Args:
+        struct_type: msgspec Struct class the tuples are meant for
+        paths: Struct field name -> dotted source path
+        name: Name of the generated function
+        
+    Raises:
+        ValueError: If a path names an unknown field, or an unmapped
+            field is not a trailing field with a default
+    """
+    fields = struct_type.__struct_fields__
+    unknown = set(paths) - set(fields)
+    if unknown:
+        raise ValueError(f"{struct_type.__name__} has no fields {sorted(unknown)}")
+    
+    mapped_count = sum(1 for f in fields if f in paths)
+    unmapped = fields[mapped_count:]
+    if any(f not in paths for f in fields[:mapped_count]):
+        raise ValueError(f"Unmapped {struct_type.__name__} fields must come after all mapped fields")
+    if len(unmapped) > len(struct_type.__struct_defaults__):
+        raise ValueError(f"Unmapped {struct_type.__name__} fields {list(unmapped)} must have defaults")
+    
+    return build_extractor({f: paths[f] for f in fields[:mapped_count]}, name)
@@ -1,7 +1,99 @@
 import httpx
+import msgspec
+import orjson
 import os
 from typing import Dict, Any, Optional, List
-from src.schemas.weather import WeatherSnapshot, ForecastItem, LocationBase
+from urllib.parse import quote
+from src.schemas.weather import WeatherSnapshotS, ForecastItemS
+from src.api.extractors import build_struct_extractor
+
+
+# Typed mirrors of the OpenWeatherMap payloads (only the fields we use).
+# Decoding straight into these parses and validates in a single pass.
+
+class OWMMain(msgspec.Struct):
+    temp: float
+    feels_like: float
+    temp_min: float
+    temp_max: float
+    pressure: int
+    humidity: int
+
+class OWMWeather(msgspec.Struct):
+    main: str
+    description: str
+    icon: str
+
+class OWMWind(msgspec.Struct):
+    speed: float
+    deg: Optional[int] = None
+
+class OWMClouds(msgspec.Struct):
+    all: int
+
+class OWMCurrent(msgspec.Struct):
+    dt: int
+    main: OWMMain
+    weather: List[OWMWeather]
+    wind: OWMWind
+    clouds: OWMClouds
+    visibility: Optional[int] = None
+
+class OWMForecastItem(msgspec.Struct):
+    dt: int
+    main: OWMMain
+    weather: List[OWMWeather]
+    wind: OWMWind
+    clouds: OWMClouds
+    pop: float = 0.0
+
+class OWMForecast(msgspec.Struct):
+    list: List[OWMForecastItem]
+
+
+_current_decoder = msgspec.json.Decoder(OWMCurrent)
+_forecast_decoder = msgspec.json.Decoder(OWMForecast)
+
+# Source path in the OpenWeatherMap payload for each struct field
+_SNAPSHOT_PATHS = {
+    "temperature": "main.temp",
+    "feels_like": "main.feels_like",
+    "temp_min": "main.temp_min",
+    "temp_max": "main.temp_max",
+    "pressure": "main.pressure",
+    "humidity": "main.humidity",
+    "weather_main": "weather.0.main",
+    "weather_description": "weather.0.description",
+    "weather_icon": "weather.0.icon",
+    "wind_speed": "wind.speed",
+    "wind_deg": "wind.deg",
+    "clouds": "clouds.all",
+    "visibility": "visibility",
+    "api_timestamp": "dt",
+}
+
+_FORECAST_PATHS = {
+    "forecast_timestamp": "dt",
+    "temperature": "main.temp",
+    "feels_like": "main.feels_like",
+    "temp_min": "main.temp_min",
+    "temp_max": "main.temp_max",
+    "pressure": "main.pressure",
+    "humidity": "main.humidity",
+    "weather_main": "weather.0.main",
+    "weather_description": "weather.0.description",
+    "weather_icon": "weather.0.icon",
+    "wind_speed": "wind.speed",
+    "wind_deg": "wind.deg",
+    "clouds": "clouds.all",
+    "pop": "pop",
+}
+
+# Extractors emit values in struct field order so the tuples can be passed
+# to the structs positionally (unmapped trailing fields keep their defaults).
+_extract_snapshot = build_struct_extractor(WeatherSnapshotS, _SNAPSHOT_PATHS, "extract_snapshot")
+_extract_forecast_item = build_struct_extractor(ForecastItemS, _FORECAST_PATHS, "extract_forecast_item")
+
 
 class WeatherAPIClient:
     """Client for OpenWeatherMap API."""
@@ -14,6 +106,10 @@ class WeatherAPIClient:
         if not self.api_key:
             raise ValueError("OpenWeatherMap API Key is required")
         self._client: Optional[httpx.AsyncClient] = None
+        # Prebuilt request URLs for the sync hot path; only lat/lon/units vary
+        appid = quote(self.api_key, safe="")
+        self._weather_url = f"{self.BASE_URL}/weather?appid={appid}&units={{units}}&lat={{lat}}&lon={{lon}}"
+        self._forecast_url = f"{self.BASE_URL}/forecast?appid={appid}&units={{units}}&lat={{lat}}&lon={{lon}}"
 
     @property
     def client(self) -> httpx.AsyncClient:
@@ -40,71 +136,23 @@ class WeatherAPIClient:
         
         response = await self.client.get(f"{self.GEO_URL}/direct", params=params)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
-    async def get_current_weather(self, lat: float, lon: float, units: str = "metric") -> WeatherSnapshot:
+    async def get_current_weather(self, lat: float, lon: float, units: str = "metric") -> WeatherSnapshotS:
         """Fetch current weather for given coordinates."""
-        params = {
-            "lat": lat,
-            "lon": lon,
-            "units": units,
-            "appid": self.api_key
-        }
-        
-        response = await self.client.get(f"{self.BASE_URL}/weather", params=params)
+        url = self._weather_url.format(units=quote(units, safe=""), lat=lat, lon=lon)
+        response = await self.client.get(url)
         response.raise_for_status()
-        data = response.json()
-        
-        return WeatherSnapshot(
-            temperature=data["main"]["temp"],
-            feels_like=data["main"]["feels_like"],
-            temp_min=data["main"]["temp_min"],
-            temp_max=data["main"]["temp_max"],
-            pressure=data["main"]["pressure"],
-            humidity=data["main"]["humidity"],
-            weather_main=data["weather"][0]["main"],
-            weather_description=data["weather"][0]["description"],
-            weather_icon=data["weather"][0]["icon"],
-            wind_speed=data["wind"]["speed"],
-            wind_deg=data["wind"].get("deg"),
-            clouds=data["clouds"]["all"],
-            visibility=data.get("visibility"),
-            api_timestamp=data["dt"]
-        )
-
-    async def get_forecast(self, lat: float, lon: float, units: str = "metric") -> List[ForecastItem]:
+        owm = _current_decoder.decode(response.content)
+        return WeatherSnapshotS(*_extract_snapshot(owm))
+
+    async def get_forecast(self, lat: float, lon: float, units: str = "metric") -> List[ForecastItemS]:
         """Fetch 5-day forecast for given coordinates."""
-        params = {
-            "lat": lat,
-            "lon": lon,
-            "units": units,
-            "appid": self.api_key
-        }
-        
-        response = await self.client.get(f"{self.BASE_URL}/forecast", params=params)
+        url = self._forecast_url.format(units=quote(units, safe=""), lat=lat, lon=lon)
+        response = await self.client.get(url)
         response.raise_for_status()
-        data = response.json()
-        
-        forecast_items = []
-        for item in data["list"]:
-            forecast_items.append(ForecastItem(
-                forecast_timestamp=item["dt"],
-                temperature=item["main"]["temp"],
-                feels_like=item["main"]["feels_like"],
-                temp_min=item["main"]["temp_min"],
-                temp_max=item["main"]["temp_max"],
-                pressure=item["main"]["pressure"],
-                humidity=item["main"]["humidity"],
-                weather_main=item["weather"][0]["main"],
-                weather_description=item["weather"][0]["description"],
-                weather_icon=item["weather"][0]["icon"],
-                wind_speed=item["wind"]["speed"],
-                wind_deg=item["wind"].get("deg"),
-                clouds=item["clouds"]["all"],
-                pop=item.get("pop", 0.0)
-            ))
-        
-        return forecast_items
+        owm = _forecast_decoder.decode(response.content)
+        return [ForecastItemS(*_extract_forecast_item(item)) for item in owm.list]
 
     async def close(self):
         await self.client.aclose()
@@ -0,0 +1,231 @@
+"""Response caching for read-heavy API endpoints."""
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class ResponseCache:
+    """Stores rendered responses (body, status and headers) keyed by request.
+
+    Entries are kept in a Redis hash when ``REDIS_URL`` is configured (or a
+    ``redis`` client is passed) and in process memory otherwise. Each entry outlives its TTL by ``stale_ttl``
+    seconds so it can still be served when the downstream call fails. The
+    in-memory store holds at most ``max_entries`` and evicts the least
+    recently used entry beyond that (Redis relies on its own LFU policy).
+
+    A generation counter is bumped on every ``expire_all``. Responses
+    rendered under an older generation are stored already stale, so a read
+    that raced with a write can't be cached as fresh.
+    """
+
+    KEY_PREFIX = "respcache:"
+    GENERATION_KEY = "respcache:gen"
+
+    # Bump the generation, then mark entries stale. Only touch keys that still
+    # exist: an HSET on a key that expired after SCAN would recreate it as a
+    # partial hash with no TTL.
+    _EXPIRE_SCRIPT = """
+        redis.call('INCR', KEYS[1])
+        for i = 2, #KEYS do
+            if redis.call('EXISTS', KEYS[i]) == 1 then
+                redis.call('HSET', KEYS[i], 'fresh_until', '0')
+            end
+        end
+    """
+
+    # Store an entry, as stale if the generation moved since it was rendered
+    _SET_SCRIPT = """
+        local fresh_until = ARGV[2]
+        if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+            fresh_until = '0'
+        end
+        redis.call('HSET', KEYS[1], 'body', ARGV[3], 'status', ARGV[4], 'headers', ARGV[5],
+                   'fresh_until', fresh_until, 'stale_until', ARGV[6])
+        redis.call('EXPIRE', KEYS[1], ARGV[7])
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        stale_ttl: int = 3600,
+        max_entries: int = 256,
+        redis: Optional[Redis] = None
+    ):
+        self.redis_url = redis_url or os.getenv("REDIS_URL")
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        if redis is None and self.redis_url:
+            # Short timeouts so an unresponsive Redis degrades to uncached responses
+            redis = Redis.from_url(self.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+        self._redis: Optional[Redis] = redis
+        self._memory: "OrderedDict[str, Dict[bytes, bytes]]" = OrderedDict()
+        self._generation = 0
+
+    async def generation(self) -> Optional[int]:
+        """Return the current generation, or None if it can't be read."""
+        if self._redis is None:
+            return self._generation
+        try:
+            return int(await self._redis.get(self.GENERATION_KEY) or 0)
+        except RedisError:
+            return None
+
+    async def get(self, key: str) -> Optional[Dict[bytes, bytes]]:
+        """Return the stored entry for a key, fresh or stale, or None."""
+        key = self.KEY_PREFIX + key
+        if self._redis is None:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if float(entry[b"stale_until"]) < time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry
+        try:
+            entry = await self._redis.hgetall(key)
+        except RedisError:
+            return None
+        # Ignore partial hashes; a complete entry always carries its body
+        return entry if b"body" in entry else None
+
+    async def set(self, key: str, response: Response, body: bytes, expire: int, generation: int):
+        """Store a rendered response for ``expire`` seconds.
+        
+        ``generation`` is the value read before the response was rendered;
+        if it has moved on since, the entry is stored as stale.
+        """
+        key = self.KEY_PREFIX + key
+        now = time.time()
+        entry = {
+            b"body": body,
+            b"status": str(response.status_code).encode(),
+            b"headers": orjson.dumps([(k.decode("latin-1"), v.decode("latin-1")) for k, v in response.headers.raw]),
+            b"fresh_until": str(now + expire).encode(),
+            b"stale_until": str(now + expire + self.stale_ttl).encode(),
+        }
+        if self._redis is None:
+            if generation != self._generation:
+                entry[b"fresh_until"] = b"0"
+            # Sweep expired entries, then evict least recently used ones over the limit
+            for stale_key in [k for k, e in self._memory.items() if float(e[b"stale_until"]) < now]:
+                del self._memory[stale_key]
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+            return
+        try:
+            await self._redis.eval(
+                self._SET_SCRIPT, 2, key, self.GENERATION_KEY,
+                generation, entry[b"fresh_until"], entry[b"body"], entry[b"status"],
+                entry[b"headers"], entry[b"stale_until"], expire + self.stale_ttl
+            )
+        except RedisError:
+            pass
+
+    async def expire_all(self):
+        """Mark every entry as stale; they remain available as an error fallback."""
+        if self._redis is None:
+            self._generation += 1
+            for entry in self._memory.values():
+                entry[b"fresh_until"] = b"0"
+            return
+        try:
+            # Entry keys are paths, so "/*" skips the generation key
+            keys = [key async for key in self._redis.scan_iter(match=self.KEY_PREFIX + "/*")]
+            await self._redis.eval(self._EXPIRE_SCRIPT, len(keys) + 1, self.GENERATION_KEY, *keys)
+        except RedisError:
+            pass
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    @staticmethod
+    def is_fresh(entry: Dict[bytes, bytes]) -> bool:
+        return float(entry[b"fresh_until"]) > time.time()
+
+    @staticmethod
+    def to_response(entry: Dict[bytes, bytes], cache_status: str) -> Response:
+        response = Response(content=entry[b"body"], status_code=int(entry[b"status"]))
+        response.raw_headers = [
+            (k.encode("latin-1"), v.encode("latin-1")) for k, v in orjson.loads(entry[b"headers"])
+        ]
+        response.headers["X-Cache"] = cache_status
+        return response
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Caches successful GET responses for matching paths.
+
+    Args:
+        cache: Backing ResponseCache
+        rules: (path regex, TTL in seconds) pairs; the first match wins
+        cache_fallback: Serve a stale entry when the endpoint raises or
+            returns a 5xx response
+    """
+
+    def __init__(self, app, cache: ResponseCache, rules: List[Tuple[str, int]], cache_fallback: bool = True):
+        super().__init__(app)
+        self.cache = cache
+        self.rules = [(re.compile(pattern), expire) for pattern, expire in rules]
+        self.cache_fallback = cache_fallback
+
+    def _expire_for(self, path: str) -> Optional[int]:
+        for pattern, expire in self.rules:
+            if pattern.fullmatch(path):
+                return expire
+        return None
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method in ("HEAD", "OPTIONS"):
+            return await call_next(request)
+        if request.method != "GET":
+            response = await call_next(request)
+            # Any successful write may change what the cached reads return
+            if response.status_code < 400:
+                await self.cache.expire_all()
+            return response
+
+        expire = self._expire_for(request.url.path)
+        if expire is None:
+            return await call_next(request)
+
+        # Cached endpoints take no query parameters, so the path alone is the key;
+        # including the raw query string would let arbitrary ?x=... fill the cache.
+        key = request.url.path
+        entry = await self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self.cache.to_response(entry, "HIT")
+        # Read before rendering so a write that lands meanwhile is detected
+        generation = await self.cache.generation()
+
+        try:
+            response = await call_next(request)
+        except Exception:
+            if self.cache_fallback and entry is not None:
+                return self.cache.to_response(entry, "STALE")
+            raise
+
+        if response.status_code >= 500 and self.cache_fallback and entry is not None:
+            return self.cache.to_response(entry, "STALE")
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        if generation is not None:
+            await self.cache.set(key, response, body, expire, generation)
+        cached = Response(content=body, status_code=response.status_code)
+        cached.raw_headers = response.headers.raw
+        cached.headers["X-Cache"] = "MISS"
+        return cached
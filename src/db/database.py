@@ -8,6 +8,16 @@ import os
 class Database:
     """SQLite database connection manager."""
     
+    # One-time data migrations, applied in order; PRAGMA user_version records
+    # how many have run so each executes once per database.
+    MIGRATIONS = [
+        # 1: timestamps written as text by earlier versions -> epoch seconds
+        """
+        UPDATE weather_snapshots SET timestamp = CAST(strftime('%s', timestamp) AS INTEGER) WHERE typeof(timestamp) = 'text';
+        UPDATE sync_history SET synced_at = CAST(strftime('%s', synced_at) AS INTEGER) WHERE typeof(synced_at) = 'text';
+        """,
+    ]
+    
     def __init__(self, db_path: Optional[str] = None):
         """Initialize database connection.
         
@@ -27,11 +37,16 @@ class Database:
             self._connection = sqlite3.connect(
                 self.db_path,
                 check_same_thread=False,
-                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+                cached_statements=128
             )
             self._connection.row_factory = sqlite3.Row
             # Enable foreign keys
             self._connection.execute("PRAGMA foreign_keys = ON")
+            # WAL lets a sync commit with a single fsync and keeps reads unblocked
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute("PRAGMA temp_store = MEMORY")
+            self._connection.execute("PRAGMA mmap_size = 268435456")
         return self._connection
     
     def close(self):
@@ -52,6 +67,14 @@ class Database:
         conn = self.connect()
         conn.executescript(schema_sql)
         conn.commit()
+        self.migrate()
+    
+    def migrate(self):
+        """Apply data migrations this database has not run yet."""
+        conn = self.connect()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, script in enumerate(self.MIGRATIONS[version:], start=version + 1):
+            conn.executescript(f"BEGIN; {script} PRAGMA user_version = {number}; COMMIT;")
     
     def execute(self, query: str, params: tuple = ()):
         """Execute a query and return cursor.
@@ -66,16 +89,30 @@ class Database:
         conn = self.connect()
         return conn.execute(query, params)
     
-    def execute_many(self, query: str, params_list: list):
+    def execute_many(self, query: str, params_list: list, commit: bool = True):
         """Execute a query multiple times with different parameters.
         
         Args:
             query: SQL query string
             params_list: List of parameter tuples
+            commit: Commit after executing. Pass False when running inside
+                a larger transaction that the caller commits.
         """
         conn = self.connect()
         conn.executemany(query, params_list)
-        conn.commit()
+        if commit:
+            conn.commit()
+    
+    def begin(self):
+        """Start an IMMEDIATE transaction.
+        
+        Any transaction left open by a previously failed statement is
+        rolled back first, since sqlite cannot nest transactions.
+        """
+        conn = self.connect()
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute("BEGIN IMMEDIATE")
     
     def commit(self):
         """Commit current transaction."""
@@ -7,18 +7,22 @@ root_dir = Path(__file__).resolve().parent.parent
 if str(root_dir) not in sys.path:
     sys.path.append(str(root_dir))
 
-from fastapi import FastAPI, HTTPException, Depends, Query
+import httpx
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from typing import List, Optional
 from src.db.database import get_db, Database
 from src.schemas.weather import (
     Location, LocationCreate, LocationUpdate, 
     WeatherSnapshot, ForecastItem, WeatherData,
-    Preference, PreferenceUpdate
+    Preference, PreferenceUpdate, WeatherDataS, from_epoch
 )
 from src.api.weather_client import WeatherAPIClient
 from src.services.weather_service import WeatherService
+from src.cache.response_cache import ResponseCache, ResponseCacheMiddleware
 import os
+import msgspec
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -27,12 +31,41 @@ from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    if not API_KEY:
+        raise RuntimeError("OPENWEATHER_API_KEY is not set; add it to the environment or a .env file")
     # Initialize DB schema
     db = get_db()
     db.initialize_schema()
+    # Shared HTTP client so OpenWeatherMap connections are kept alive across requests
+    app.state.http = httpx.AsyncClient(
+        timeout=30.0,
+        trust_env=False,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+    app.state.api_client = WeatherAPIClient(api_key=API_KEY)
+    app.state.api_client.set_client(app.state.http)
     yield
+    await app.state.http.aclose()
+    await response_cache.close()
+
+app = FastAPI(
+    title="Weather Data Integration Platform",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
-app = FastAPI(title="Weather Data Integration Platform", lifespan=lifespan)
+# Response cache for read endpoints (Redis when REDIS_URL is set, in-memory otherwise).
+# Registered before CORS so cached entries never carry per-origin headers.
+response_cache = ResponseCache()
+app.add_middleware(
+    ResponseCacheMiddleware,
+    cache=response_cache,
+    rules=[
+        (r"/locations", 300),
+        (r"/locations/\d+/weather", 30),
+    ],
+    cache_fallback=True,
+)
 
 # CORS middleware
 app.add_middleware(
@@ -43,15 +76,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# API Key check
+# API Key (required; checked at startup)
 API_KEY = os.getenv("OPENWEATHER_API_KEY")
-if not API_KEY:
-    print("Warning: OPENWEATHER_API_KEY not found in environment variables.")
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response rendered by msgspec, which encodes Structs natively.
+
+    Endpoints that build msgspec structs return this directly, so the
+    payload is serialized in a single pass instead of being re-validated
+    and dumped through the Pydantic response_model first.
+    """
+
+    def render(self, content) -> bytes:
+        return msgspec.json.encode(content)
 
 # Dependency injection for services
-def get_weather_service(db: Database = Depends(get_db)):
-    client = WeatherAPIClient(api_key=API_KEY)
-    return WeatherService(db, client)
+def get_weather_service(request: Request, db: Database = Depends(get_db)):
+    return WeatherService(db, request.app.state.api_client)
 
 
 @app.post("/locations", response_model=Location)
@@ -68,7 +109,7 @@ async def create_location(
 
 @app.get("/locations", response_model=List[Location])
 async def get_locations(service: WeatherService = Depends(get_weather_service)):
-    return service.get_all_locations()
+    return MsgspecJSONResponse(service.get_all_locations())
 
 @app.get("/locations/{location_id}", response_model=Location)
 async def get_location(
@@ -106,18 +147,17 @@ async def sync_weather(
     service: WeatherService = Depends(get_weather_service)
 ):
     try:
-        current, forecast = await service.sync_weather(location_id)
+        current, forecast, last_synced = await service.sync_weather(location_id)
         location = service.get_location(location_id)
         if not location:
             raise HTTPException(status_code=404, detail="Location record missing after sync")
             
-        last_synced = service.get_last_sync_time(location_id)
-        return WeatherData(
+        return MsgspecJSONResponse(WeatherDataS(
             location=location,
             current=current,
             forecast=forecast,
-            last_synced=last_synced
-        )
+            last_synced=from_epoch(last_synced)
+        ))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -139,12 +179,12 @@ async def get_weather_data(
     forecast = service.get_forecast(location_id)
     last_synced = service.get_last_sync_time(location_id)
     
-    return WeatherData(
+    return MsgspecJSONResponse(WeatherDataS(
         location=location,
         current=current,
         forecast=forecast,
-        last_synced=last_synced
-    )
+        last_synced=from_epoch(last_synced)
+    ))
 
 @app.get("/preferences", response_model=List[Preference])
 async def get_preferences(service: WeatherService = Depends(get_weather_service)):
@@ -156,8 +196,8 @@ async def update_preference(
     update: PreferenceUpdate, 
     service: WeatherService = Depends(get_weather_service)
 ):
-    service.update_preference(key, update.value)
-    return {"status": "updated", "key": key, "value": update.value}
+    value = service.update_preference(key, update.value)
+    return {"status": "updated", "key": key, "value": value}
 
 if __name__ == "__main__":
     import uvicorn
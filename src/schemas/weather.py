@@ -1,6 +1,7 @@
+import msgspec
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 class LocationBase(BaseModel):
     name: str
@@ -43,6 +44,9 @@ class WeatherSnapshot(BaseModel):
     api_timestamp: int
     timestamp: Optional[datetime] = None
 
+    class Config:
+        from_attributes = True
+
 class ForecastItem(BaseModel):
     forecast_timestamp: int
     temperature: float
@@ -59,6 +63,9 @@ class ForecastItem(BaseModel):
     clouds: int
     pop: float
 
+    class Config:
+        from_attributes = True
+
 class WeatherData(BaseModel):
     location: Location
     current: Optional[WeatherSnapshot] = None
@@ -71,3 +78,78 @@ class Preference(BaseModel):
 
 class PreferenceUpdate(BaseModel):
     value: str
+
+
+def from_epoch(ts: Optional[int]) -> Optional[datetime]:
+    """Convert stored epoch seconds to the naive UTC datetime exposed by the API."""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+# Lightweight internal representations used when marshalling database rows.
+# They mirror the Pydantic models above field-for-field; the Pydantic models
+# are only applied at the API boundary (via from_attributes). Field order
+# doubles as the SELECT column order, since rows are unpacked positionally.
+
+class LocationS(msgspec.Struct):
+    name: str
+    country: str
+    latitude: float
+    longitude: float
+    id: int
+    display_name: Optional[str]
+    is_favorite: bool
+    created_at: datetime
+    updated_at: datetime
+
+    def __post_init__(self):
+        # sqlite stores BOOLEAN columns as 0/1 and these TIMESTAMP columns as text
+        self.is_favorite = bool(self.is_favorite)
+        if isinstance(self.created_at, str):
+            self.created_at = datetime.fromisoformat(self.created_at)
+        if isinstance(self.updated_at, str):
+            self.updated_at = datetime.fromisoformat(self.updated_at)
+
+class WeatherSnapshotS(msgspec.Struct):
+    temperature: float
+    feels_like: float
+    temp_min: float
+    temp_max: float
+    pressure: int
+    humidity: int
+    weather_main: str
+    weather_description: str
+    weather_icon: str
+    wind_speed: float
+    wind_deg: Optional[int]
+    clouds: int
+    visibility: Optional[int]
+    api_timestamp: int
+    timestamp: Optional[datetime] = None
+
+    def __post_init__(self):
+        # Stored as epoch seconds
+        if isinstance(self.timestamp, int):
+            self.timestamp = from_epoch(self.timestamp)
+
+class ForecastItemS(msgspec.Struct):
+    forecast_timestamp: int
+    temperature: float
+    feels_like: float
+    temp_min: float
+    temp_max: float
+    pressure: int
+    humidity: int
+    weather_main: str
+    weather_description: str
+    weather_icon: str
+    wind_speed: float
+    wind_deg: Optional[int]
+    clouds: int
+    pop: float
+
+class WeatherDataS(msgspec.Struct):
+    location: LocationS
+    current: Optional[WeatherSnapshotS] = None
+    forecast: Optional[List[ForecastItemS]] = None
+    last_synced: Optional[datetime] = None
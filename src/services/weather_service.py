@@ -1,28 +1,58 @@
+import asyncio
 from typing import List, Optional, Tuple
-from datetime import datetime
 from src.db.database import Database
-from src.schemas.weather import Location, WeatherSnapshot, ForecastItem, LocationCreate, LocationUpdate
+from src.schemas.weather import (
+    LocationCreate, LocationUpdate, LocationS, WeatherSnapshotS, ForecastItemS
+)
 from src.api.weather_client import WeatherAPIClient
 import json
+from msgspec.structs import astuple
+
+# Explicit column lists in struct field order, so rows can be unpacked
+# positionally into the structs regardless of the table's column order.
+_LOCATION_COLUMNS = ", ".join(LocationS.__struct_fields__)
+_SNAPSHOT_COLUMNS = ", ".join(WeatherSnapshotS.__struct_fields__)
+_FORECAST_COLUMNS = ", ".join(ForecastItemS.__struct_fields__)
 
 class WeatherService:
+    # Sync statements are kept as single constants so every sync hands sqlite3
+    # the same SQL text and hits its prepared-statement cache.
+    _SNAPSHOT_INSERT_SQL = """
+        INSERT INTO weather_snapshots (
+            location_id, temperature, feels_like, temp_min, temp_max, 
+            pressure, humidity, weather_main, weather_description, 
+            weather_icon, wind_speed, wind_deg, clouds, visibility, api_timestamp, timestamp
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+    """
+
+    # Columns follow ForecastItemS field order, matching rows built with astuple()
+    _FORECAST_INSERT_SQL = f"""
+        INSERT INTO forecasts (location_id, {_FORECAST_COLUMNS})
+        VALUES (?, {", ".join("?" * len(ForecastItemS.__struct_fields__))})
+    """
+
     def __init__(self, db: Database, api_client: WeatherAPIClient):
         self.db = db
         self.api_client = api_client
 
-    async def add_location(self, location_data: LocationCreate) -> Location:
-        # 1. Get coordinates from API
+    async def add_location(self, location_data: LocationCreate) -> LocationS:
+        # 1. Reuse an existing record to skip the geocoding round-trip
+        existing = self.find_location(location_data.name, location_data.country)
+        if existing:
+            return existing
+        
+        # 2. Get coordinates from API
         geo_results = await self.api_client.get_location_coords(location_data.name, location_data.country)
         if not geo_results:
             raise ValueError(f"Location not found: {location_data.name}")
         
         best_match = geo_results[0]
         
-        # 2. Store in DB
-        query = """
+        # 3. Store in DB
+        query = f"""
             INSERT INTO locations (name, country, latitude, longitude, display_name)
             VALUES (?, ?, ?, ?, ?)
-            RETURNING *
+            RETURNING {_LOCATION_COLUMNS}
         """
         cursor = self.db.execute(query, (
             best_match["name"],
@@ -33,18 +63,28 @@ class WeatherService:
         ))
         row = cursor.fetchone()
         self.db.commit()
-        return Location(**dict(row))
+        return LocationS(*row)
 
-    def get_all_locations(self) -> List[Location]:
-        cursor = self.db.execute("SELECT * FROM locations ORDER BY is_favorite DESC, name ASC")
-        return [Location(**dict(row)) for row in cursor.fetchall()]
+    def find_location(self, name: str, country: Optional[str] = None) -> Optional[LocationS]:
+        """Look up a stored location by case-insensitive name and optional country code."""
+        cursor = self.db.execute(f"""
+            SELECT {_LOCATION_COLUMNS} FROM locations
+            WHERE lower(name) = lower(?) AND (country = upper(?) OR ? IS NULL)
+            ORDER BY id LIMIT 1
+        """, (name, country, country))
+        row = cursor.fetchone()
+        return LocationS(*row) if row else None
+
+    def get_all_locations(self) -> List[LocationS]:
+        cursor = self.db.execute(f"SELECT {_LOCATION_COLUMNS} FROM locations ORDER BY is_favorite DESC, name ASC")
+        return [LocationS(*row) for row in cursor]
 
-    def get_location(self, location_id: int) -> Optional[Location]:
-        cursor = self.db.execute("SELECT * FROM locations WHERE id = ?", (location_id,))
+    def get_location(self, location_id: int) -> Optional[LocationS]:
+        cursor = self.db.execute(f"SELECT {_LOCATION_COLUMNS} FROM locations WHERE id = ?", (location_id,))
         row = cursor.fetchone()
-        return Location(**dict(row)) if row else None
+        return LocationS(*row) if row else None
 
-    def update_location(self, location_id: int, update_data: LocationUpdate) -> Optional[Location]:
+    def update_location(self, location_id: int, update_data: LocationUpdate) -> Optional[LocationS]:
         updates = []
         params = []
         if update_data.display_name is not None:
@@ -63,16 +103,14 @@ class WeatherService:
         self.db.commit()
         
         # Fetch the updated record
-        cursor = self.db.execute("SELECT * FROM locations WHERE id = ?", (location_id,))
-        row = cursor.fetchone()
-        return Location(**dict(row)) if row else None
+        return self.get_location(location_id)
 
     def delete_location(self, location_id: int) -> bool:
         cursor = self.db.execute("DELETE FROM locations WHERE id = ?", (location_id,))
         self.db.commit()
         return cursor.rowcount > 0
 
-    async def sync_weather(self, location_id: int) -> Tuple[WeatherSnapshot, List[ForecastItem]]:
+    async def sync_weather(self, location_id: int) -> Tuple[WeatherSnapshotS, List[ForecastItemS], int]:
         location = self.get_location(location_id)
         if not location:
             raise ValueError("Location not found")
@@ -83,18 +121,17 @@ class WeatherService:
         units = row["value"] if row else "metric"
         
         try:
-            # Fetch current and forecast
-            current = await self.api_client.get_current_weather(location.latitude, location.longitude, units=units)
-            forecast = await self.api_client.get_forecast(location.latitude, location.longitude, units=units)
+            # Fetch current and forecast concurrently
+            current, forecast = await asyncio.gather(
+                self.api_client.get_current_weather(location.latitude, location.longitude, units=units),
+                self.api_client.get_forecast(location.latitude, location.longitude, units=units)
+            )
             
+            # Write everything for this sync in a single transaction
+            self.db.begin()
+
             # Store current weather
-            self.db.execute("""
-                INSERT INTO weather_snapshots (
-                    location_id, temperature, feels_like, temp_min, temp_max, 
-                    pressure, humidity, weather_main, weather_description, 
-                    weather_icon, wind_speed, wind_deg, clouds, visibility, api_timestamp
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            self.db.execute(self._SNAPSHOT_INSERT_SQL, (
                 location_id, current.temperature, current.feels_like, current.temp_min, current.temp_max,
                 current.pressure, current.humidity, current.weather_main, current.weather_description,
                 current.weather_icon, current.wind_speed, current.wind_deg, current.clouds, 
@@ -104,55 +141,47 @@ class WeatherService:
             # Update forecasts (clear old ones first for this location)
             self.db.execute("DELETE FROM forecasts WHERE location_id = ?", (location_id,))
             
-            for item in forecast:
-                self.db.execute("""
-                    INSERT INTO forecasts (
-                        location_id, forecast_timestamp, temperature, feels_like, 
-                        temp_min, temp_max, pressure, humidity, weather_main, 
-                        weather_description, weather_icon, wind_speed, wind_deg, clouds, pop
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    location_id, item.forecast_timestamp, item.temperature, item.feels_like,
-                    item.temp_min, item.temp_max, item.pressure, item.humidity, item.weather_main,
-                    item.weather_description, item.weather_icon, item.wind_speed, item.wind_deg,
-                    item.clouds, item.pop
-                ))
+            rows = [(location_id, *astuple(item)) for item in forecast]
+            self.db.execute_many(self._FORECAST_INSERT_SQL, rows, commit=False)
             
             # Record sync history
-            self.db.execute("""
-                INSERT INTO sync_history (location_id, sync_type, status)
-                VALUES (?, 'all', 'success')
+            cursor = self.db.execute("""
+                INSERT INTO sync_history (location_id, sync_type, status, synced_at)
+                VALUES (?, 'all', 'success', CAST(strftime('%s', 'now') AS INTEGER))
+                RETURNING synced_at
             """, (location_id,))
+            synced_at = cursor.fetchone()["synced_at"]
             
             self.db.commit()
-            return current, forecast
+            return current, forecast, synced_at
             
         except Exception as e:
+            self.db.rollback()
             self.db.execute("""
-                INSERT INTO sync_history (location_id, sync_type, status, error_message)
-                VALUES (?, 'all', 'failed', ?)
+                INSERT INTO sync_history (location_id, sync_type, status, error_message, synced_at)
+                VALUES (?, 'all', 'failed', ?, CAST(strftime('%s', 'now') AS INTEGER))
             """, (location_id, str(e)))
             self.db.commit()
             raise e
 
-    def get_latest_weather(self, location_id: int) -> Optional[WeatherSnapshot]:
-        cursor = self.db.execute("""
-            SELECT * FROM weather_snapshots 
+    def get_latest_weather(self, location_id: int) -> Optional[WeatherSnapshotS]:
+        cursor = self.db.execute(f"""
+            SELECT {_SNAPSHOT_COLUMNS} FROM weather_snapshots 
             WHERE location_id = ? 
             ORDER BY timestamp DESC LIMIT 1
         """, (location_id,))
         row = cursor.fetchone()
-        return WeatherSnapshot(**dict(row)) if row else None
+        return WeatherSnapshotS(*row) if row else None
 
-    def get_forecast(self, location_id: int) -> List[ForecastItem]:
-        cursor = self.db.execute("""
-            SELECT * FROM forecasts 
+    def get_forecast(self, location_id: int) -> List[ForecastItemS]:
+        cursor = self.db.execute(f"""
+            SELECT {_FORECAST_COLUMNS} FROM forecasts 
             WHERE location_id = ? 
             ORDER BY forecast_timestamp ASC
         """, (location_id,))
-        return [ForecastItem(**dict(row)) for row in cursor.fetchall()]
+        return [ForecastItemS(*row) for row in cursor]
 
-    def get_last_sync_time(self, location_id: int) -> Optional[datetime]:
+    def get_last_sync_time(self, location_id: int) -> Optional[int]:
         cursor = self.db.execute("""
             SELECT synced_at FROM sync_history 
             WHERE location_id = ? AND status = 'success'
@@ -165,9 +194,12 @@ class WeatherService:
         cursor = self.db.execute("SELECT key, value FROM user_preferences")
         return [dict(row) for row in cursor.fetchall()]
 
-    def update_preference(self, key: str, value: str):
-        self.db.execute(
-            "UPDATE user_preferences SET value = ?, updated_at = CURRENT_TIMESTAMP WHERE key = ?",
-            (value, key)
-        )
+    def update_preference(self, key: str, value: str) -> str:
+        cursor = self.db.execute("""
+            INSERT INTO user_preferences (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+            RETURNING value
+        """, (key, value))
+        stored = cursor.fetchone()["value"]
         self.db.commit()
+        return stored
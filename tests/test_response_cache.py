@@ -0,0 +1,152 @@
+import asyncio
+import time
+import fakeredis
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import Response
+from src.cache.response_cache import ResponseCache, ResponseCacheMiddleware
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "memory":
+        return ResponseCache(redis_url=None)
+    return ResponseCache(redis=fakeredis.FakeAsyncRedis())
+
+@pytest.fixture
+def app(cache):
+    app = FastAPI()
+    app.state.calls = 0
+    app.state.fail = False
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=cache,
+        rules=[(r"/items", 60)],
+    )
+
+    @app.get("/items")
+    async def items():
+        if app.state.fail:
+            raise RuntimeError("database unavailable")
+        app.state.calls += 1
+        return {"calls": app.state.calls}
+
+    @app.post("/items")
+    async def create_item():
+        return {"status": "created"}
+
+    return app
+
+def test_get_served_from_cache(app):
+    with TestClient(app) as client:
+        first = client.get("/items")
+        second = client.get("/items")
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == {"calls": 1}
+        assert second.headers["content-type"] == "application/json"
+
+def test_write_expires_cached_entries(app):
+    with TestClient(app) as client:
+        client.get("/items")
+        client.post("/items")
+
+        response = client.get("/items")
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.json() == {"calls": 2}
+
+def test_stale_entry_served_on_error(app):
+    with TestClient(app, raise_server_exceptions=False) as client:
+        client.get("/items")
+        client.post("/items")
+        app.state.fail = True
+
+        response = client.get("/items")
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "STALE"
+        assert response.json() == {"calls": 1}
+
+def test_query_string_does_not_create_entries(app):
+    with TestClient(app) as client:
+        client.get("/items")
+    
+        response = client.get("/items?x=1")
+        assert response.headers["X-Cache"] == "HIT"
+
+@pytest.mark.asyncio
+async def test_read_racing_a_write_is_not_cached_as_fresh(cache):
+    app = FastAPI()
+    app.state.n = 0
+    app.add_middleware(ResponseCacheMiddleware, cache=cache, rules=[(r"/items", 60)])
+
+    @app.get("/items")
+    async def items():
+        n = app.state.n
+        # Let the write land between the read and the response being cached
+        await asyncio.sleep(0.05)
+        return {"n": n}
+
+    @app.post("/items")
+    async def create_item():
+        app.state.n += 1
+        return {"status": "created"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await asyncio.gather(client.get("/items"), client.post("/items"))
+        response = await client.get("/items")
+    
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json() == {"n": 1}
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used():
+    cache = ResponseCache(redis_url=None, max_entries=2)
+    response = Response(content=b"{}")
+    await cache.set("/a", response, b"{}", 60, 0)
+    await cache.set("/b", response, b"{}", 60, 0)
+    await cache.get("/a")
+    await cache.set("/c", response, b"{}", 60, 0)
+    
+    assert await cache.get("/a") is not None
+    assert await cache.get("/b") is None
+    assert await cache.get("/c") is not None
+
+@pytest.mark.asyncio
+async def test_redis_expire_all_skips_vanished_keys():
+    redis = fakeredis.FakeAsyncRedis()
+    cache = ResponseCache(redis=redis)
+    await cache.set("/a", Response(content=b"{}"), b"{}", 60, 0)
+    
+    # A key that expires between SCAN and the update must not be recreated
+    await redis.eval(ResponseCache._EXPIRE_SCRIPT, 3, ResponseCache.GENERATION_KEY, "respcache:/a", "respcache:/gone")
+    
+    assert not await redis.exists("respcache:/gone")
+    entry = await cache.get("/a")
+    assert not cache.is_fresh(entry)
+    assert await redis.ttl("respcache:/a") > 0
+    assert await cache.generation() == 1
+
+@pytest.mark.asyncio
+async def test_redis_partial_entry_ignored():
+    redis = fakeredis.FakeAsyncRedis()
+    await redis.hset("respcache:/a", b"fresh_until", b"0")
+    
+    assert await ResponseCache(redis=redis).get("/a") is None
+
+@pytest.mark.asyncio
+async def test_unresponsive_redis_falls_back_to_uncached():
+    # Accepts connections but never answers
+    server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    cache = ResponseCache(redis_url=f"redis://127.0.0.1:{port}/0")
+    
+    started = time.monotonic()
+    assert await cache.get("/a") is None
+    assert await cache.generation() is None
+    await cache.expire_all()
+    assert time.monotonic() - started < 5
+    
+    await cache.close()
+    server.close()
@@ -0,0 +1,74 @@
+import httpx
+import orjson
+import pytest
+from src.api.weather_client import WeatherAPIClient
+import msgspec
+from types import SimpleNamespace
+from typing import Optional
+from src.api.extractors import build_extractor, build_struct_extractor
+
+def owm_item(dt):
+    return {
+        "dt": dt,
+        "main": {"temp": 15, "feels_like": 14.1, "temp_min": 13.0, "temp_max": 17.0, "pressure": 1012, "humidity": 70},
+        "weather": [{"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04d"}],
+        "wind": {"speed": 5.1, "deg": 250},
+        "clouds": {"all": 75},
+        "pop": 0.3
+    }
+
+@pytest.fixture
+def api_client():
+    def handler(request):
+        assert request.url.params["appid"] == "test"
+        assert request.url.params["units"] == "metric"
+        assert request.url.params["lat"] == "51.5"
+        if request.url.path.endswith("/weather"):
+            body = owm_item(1618317040)
+            del body["pop"], body["wind"]["deg"]
+            return httpx.Response(200, content=orjson.dumps(body))
+        return httpx.Response(200, content=orjson.dumps({"list": [owm_item(1618317040), owm_item(1618327840)]}))
+
+    client = WeatherAPIClient(api_key="test")
+    client.set_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return client
+
+@pytest.mark.asyncio
+async def test_get_current_weather(api_client):
+    current = await api_client.get_current_weather(51.5, -0.12)
+    
+    assert current.temperature == 15.0
+    assert current.weather_icon == "04d"
+    assert current.wind_deg is None
+    assert current.visibility is None
+    assert current.api_timestamp == 1618317040
+    assert current.timestamp is None
+
+@pytest.mark.asyncio
+async def test_get_forecast(api_client):
+    forecast = await api_client.get_forecast(51.5, -0.12)
+    
+    assert [item.forecast_timestamp for item in forecast] == [1618317040, 1618327840]
+    assert forecast[0].weather_description == "broken clouds"
+    assert forecast[0].wind_deg == 250
+    assert forecast[0].clouds == 75
+    assert forecast[0].pop == 0.3
+
+def test_build_extractor_rejects_invalid_paths():
+    with pytest.raises(ValueError):
+        build_extractor({"x": "main.temp()"})
+
+def test_build_struct_extractor_rejects_gaps():
+    class Sample(msgspec.Struct):
+        a: int
+        b: int
+        c: Optional[int] = None
+    
+    extract = build_struct_extractor(Sample, {"b": "y", "a": "x"})
+    assert Sample(*extract(SimpleNamespace(x=1, y=2))) == Sample(1, 2)
+    with pytest.raises(ValueError):
+        build_struct_extractor(Sample, {"a": "x", "c": "z"})
+    with pytest.raises(ValueError):
+        build_struct_extractor(Sample, {"a": "x"})
+    with pytest.raises(ValueError):
+        build_struct_extractor(Sample, {"a": "x", "b": "y", "d": "w"})
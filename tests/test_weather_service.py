@@ -1,9 +1,14 @@
 import pytest
+import shutil
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
+from src.db.database import Database
 from src.services.weather_service import WeatherService
-from src.schemas.weather import LocationCreate, Location, WeatherSnapshot
+from src.schemas.weather import LocationCreate, Location, WeatherSnapshot, LocationS
 from datetime import datetime
 
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "database" / "init.sql"
+
 @pytest.fixture
 def mock_db():
     db = MagicMock()
@@ -21,6 +26,14 @@ def mock_db():
     }
     return db
 
+@pytest.fixture
+def sqlite_db(tmp_path):
+    shutil.copy(SCHEMA_PATH, tmp_path / "init.sql")
+    db = Database(str(tmp_path / "weather.db"))
+    db.initialize_schema()
+    yield db
+    db.close()
+
 @pytest.fixture
 def mock_api_client():
     client = AsyncMock()
@@ -41,7 +54,9 @@ def mock_api_client():
         weather_description="broken clouds",
         weather_icon="04d",
         wind_speed=5.0,
+        wind_deg=None,
         clouds=75,
+        visibility=None,
         api_timestamp=1618317040
     )
     client.get_forecast.return_value = []
@@ -51,6 +66,11 @@ def mock_api_client():
 async def test_add_location(mock_db, mock_api_client):
     service = WeatherService(mock_db, mock_api_client)
     location_data = LocationCreate(name="London")
+    # No stored match, then the INSERT ... RETURNING row (LocationS field order)
+    mock_db.execute.return_value.fetchone.side_effect = [
+        None,
+        ("London", "GB", 51.5074, -0.1278, 1, "London", 0, datetime.now(), datetime.now())
+    ]
     
     location = await service.add_location(location_data)
     
@@ -70,9 +90,80 @@ async def test_sync_weather(mock_db, mock_api_client):
         display_name="London", is_favorite=False, 
         created_at=datetime.now(), updated_at=datetime.now()
     ))
+    # Units preference lookup and the RETURNING synced_at row share this mock
+    synced_at = 1704110400
+    mock_db.execute.return_value.fetchone.return_value = {"value": "metric", "synced_at": synced_at}
     
-    current, forecast = await service.sync_weather(1)
+    current, forecast, last_synced = await service.sync_weather(1)
     
     assert current.temperature == 15.0
     assert len(forecast) == 0
+    assert last_synced == synced_at
     assert mock_db.commit.called
+    assert mock_db.begin.called
+    mock_db.execute_many.assert_called_once()
+    assert mock_db.execute_many.call_args.kwargs["commit"] is False
+
+def test_get_all_locations(sqlite_db, mock_api_client):
+    sqlite_db.execute("""
+        INSERT INTO locations (name, country, latitude, longitude, display_name, is_favorite)
+        VALUES ('London', 'GB', 51.5074, -0.1278, 'London', 0), ('Paris', 'FR', 48.8566, 2.3522, NULL, 1)
+    """)
+    sqlite_db.commit()
+    service = WeatherService(sqlite_db, mock_api_client)
+    
+    locations = service.get_all_locations()
+    
+    assert all(isinstance(loc, LocationS) for loc in locations)
+    assert [loc.name for loc in locations] == ["Paris", "London"]
+    assert locations[0].is_favorite is True
+    assert locations[0].display_name is None
+    assert locations[1].latitude == 51.5074
+    assert isinstance(locations[1].created_at, datetime)
+
+@pytest.mark.asyncio
+async def test_add_location_existing_skips_geocoding(sqlite_db, mock_api_client):
+    service = WeatherService(sqlite_db, mock_api_client)
+    
+    created = await service.add_location(LocationCreate(name="London"))
+    duplicate = await service.add_location(LocationCreate(name="london", country="gb"))
+    
+    assert duplicate.id == created.id
+    mock_api_client.get_location_coords.assert_called_once_with("London", None)
+
+def test_update_preference_upserts(sqlite_db, mock_api_client):
+    service = WeatherService(sqlite_db, mock_api_client)
+    
+    assert service.update_preference("units", "imperial") == "imperial"
+    assert service.update_preference("theme", "dark") == "dark"
+    
+    preferences = {p["key"]: p["value"] for p in service.get_preferences()}
+    assert preferences["units"] == "imperial"
+    assert preferences["theme"] == "dark"
+
+def test_timestamp_migration_runs_once(sqlite_db):
+    sqlite_db.execute("INSERT INTO locations (name, country, latitude, longitude) VALUES ('London', 'GB', 51.5, -0.1)")
+    sqlite_db.execute("""
+        INSERT INTO sync_history (location_id, sync_type, status, synced_at)
+        VALUES (1, 'all', 'success', '2024-01-01 12:00:00')
+    """)
+    sqlite_db.execute("PRAGMA user_version = 0")
+    sqlite_db.commit()
+    
+    sqlite_db.migrate()
+    
+    assert sqlite_db.execute("PRAGMA user_version").fetchone()[0] == len(Database.MIGRATIONS)
+    row = sqlite_db.execute("SELECT synced_at, typeof(synced_at) AS kind FROM sync_history").fetchone()
+    assert (row["synced_at"], row["kind"]) == (1704110400, "integer")
+    
+    # A second run must leave rows alone now that user_version is current
+    sqlite_db.execute("""
+        INSERT INTO sync_history (location_id, sync_type, status, synced_at)
+        VALUES (1, 'all', 'success', '2024-01-02 12:00:00')
+    """)
+    sqlite_db.commit()
+    sqlite_db.migrate()
+    
+    assert sqlite_db.execute("PRAGMA user_version").fetchone()[0] == len(Database.MIGRATIONS)
+    row = sqlite_db.execute("SELECT typeof(synced_at) AS kind FROM sync_history WHERE id = 2").fetchone()
+    assert row["kind"] == "text"